@@ -19,7 +19,7 @@
 #
 #Step 3: Install Required Packages
 #        Now that your virtual environment is active, install the necessary Python libraries:
-#        pip install spacy nltk pandas
+#        pip install spacy pandas
 #Step 4: Verify Everything Works
 #        Run:
 #        python3 -m spacy download en_core_web_md
@@ -30,33 +30,125 @@
 #Step 5: To run the python code
 #        Run: python3 extract_requirements2.py
 
+import os
+import string
+
+# Keep BLAS single-threaded so multiprocess nlp.pipe workers do not
+# oversubscribe the CPU cores
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
 import spacy
+from spacy.matcher import Matcher, DependencyMatcher
 import re
-from nltk.tokenize import sent_tokenize
+import numpy as np
 import pandas as pd
 from collections import Counter
-import nltk
-from nltk.corpus import stopwords
-import ssl
 
+# Numba is optional; when it is available the scoring arithmetic below is
+# JIT-compiled, which pays off on corpora with many thousands of sentences
 try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Batch size for nlp.pipe; override with REQ_SPACY_BATCH_SIZE for large corpora
+SPACY_BATCH_SIZE = int(os.environ.get("REQ_SPACY_BATCH_SIZE", "64"))
+
+# Per-sentence feature cache so repeated sentences skip the spaCy pipeline
+# entirely. A bounded dict is used instead of functools.lru_cache so that
+# cache misses can still be parsed together in one batched nlp.pipe call.
+_FEATURE_CACHE = {}
+_FEATURE_CACHE_MAX = 10_000
+
+# Precompiled cleanup patterns: whitespace collapsing and the doubled-phrase
+# fix both run per text or per requirement, so compile them once at import
+_WS_RE = re.compile(r'\s+')
+_DOUBLED_PHRASE_RE = re.compile(r'\b(should |shall |be able to )\1')
+
+# Deletion table for the dedup key in refine_requirements: str.translate
+# strips whitespace and punctuation in one C-level pass, cheaper than an
+# equivalent re.sub
+_DEDUP_STRIP = str.maketrans('', '', string.whitespace + string.punctuation)
 
-# Download necessary NLTK data
-nltk.download('punkt')
-nltk.download('punkt_tab')
-nltk.download('stopwords')
+def _score_counts(n_action_verbs, n_modals, n_svo, has_req, has_comp, has_role):
+    # Plain arithmetic over integer arrays so numba can compile it as-is
+    return (n_action_verbs * 2 + n_modals * 3 + n_svo * 2
+            + has_req * 3 + has_comp * 2 + has_role * 2)
+
+if njit is not None:
+    _score_counts = njit(cache=True)(_score_counts)
 
 class RequirementsExtractor:
-    def __init__(self):
-        # Load SpaCy model
-        self.nlp = spacy.load("en_core_web_md")
-        self.stop_words = set(stopwords.words('english'))
-        
+    # Keyword groups used for requirement scoring; frozen at class level so
+    # they are not rebuilt on every sentence
+    REQUIREMENT_KEYWORDS = frozenset(["need", "require", "must", "should", "allow", "enable", "access", "view", "book", "reserve"])
+    SYSTEM_COMPONENTS = frozenset(["machine", "payment", "reservation", "notification", "camera", "account", "feedback", "review"])
+    USER_ROLES = frozenset(["customer", "client", "user", "administrator", "owner"])
+
+    # Verb and dependency sets used during feature extraction and formulation
+    ACTION_VERBS = frozenset(["allow", "enable", "provide", "support", "manage", "monitor", "check", "view", "book", "pay", "receive", "create", "track", "generate"])
+    MODAL_VERBS = frozenset(["should", "must", "will", "can", "could"])
+    _OBJECT_DEPS = frozenset(["dobj", "pobj"])
+    _CUSTOMER_ACTORS = frozenset(["customer", "client", "user"])
+    _ADMIN_ACTORS = frozenset(["administrator", "admin", "owner"])
+    _STANDARD_PREFIXES = ("the system shall", "the customer should", "the administrator should")
+
+    # One compiled pattern per keyword family, each checked with a single
+    # search(). The families must be scanned independently: a combined
+    # alternation would consume characters across families and miss
+    # overlapping hits such as "view" inside "reviews"
+    _REQ_KEYWORD_RE = re.compile("|".join(map(re.escape, sorted(REQUIREMENT_KEYWORDS))))
+    _COMPONENT_RE = re.compile("|".join(map(re.escape, sorted(SYSTEM_COMPONENTS))))
+    _ROLE_RE = re.compile("|".join(map(re.escape, sorted(USER_ROLES))))
+
+    # Precompiled keyword patterns for classification
+    _CUSTOMER_RE = re.compile("customer|client|user")
+    _ADMIN_RE = re.compile("administrator|admin|owner")
+    _NON_FUNCTIONAL_RE = re.compile("performance|security|reliability|usability|maintainability")
+    _CATEGORY_RES = {
+        "Washing/Drying": re.compile("machine|washer|dryer|washing|drying"),
+        "Security": re.compile("security|camera|monitor|surveillance"),
+        "Scheduling": re.compile("schedule|booking|reservation|book|reserve"),
+        "Payment": re.compile("payment|pay|coin|card|credit|debit"),
+        "Reporting": re.compile("report|record|track|log"),
+        "Communication": re.compile("communicate|notification|alert|message"),
+        "Feedback": re.compile("feedback|review|comment|rating"),
+    }
+
+    # The spaCy pipeline is expensive to load, so it is created lazily on
+    # first use and shared by every extractor instance, together with the
+    # matchers that depend on its vocab
+    _nlp = None
+    _modal_matcher = None
+    _svo_matcher = None
+
+    @classmethod
+    def _get_nlp(cls):
+        if cls._nlp is None:
+            # NER is disabled since entity output is never used downstream
+            # and skipping it cuts per-sentence processing cost
+            nlp = spacy.load("en_core_web_md", disable=["ner"])
+            # Rule-based sentence splitting is much cheaper than a full parse
+            nlp.add_pipe("sentencizer", first=True)
+
+            # Modal auxiliaries and subject-verb-object triples are found by
+            # spaCy's compiled matching engine instead of Python token loops
+            cls._modal_matcher = Matcher(nlp.vocab)
+            cls._modal_matcher.add("MODAL", [[{"DEP": "aux", "LOWER": {"IN": sorted(cls.MODAL_VERBS)}}]])
+            cls._svo_matcher = DependencyMatcher(nlp.vocab)
+            cls._svo_matcher.add("SVO", [[
+                {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": "VERB"}},
+                {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject", "RIGHT_ATTRS": {"DEP": "nsubj"}},
+                {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "object", "RIGHT_ATTRS": {"DEP": {"IN": ["dobj", "pobj"]}}},
+            ]])
+            cls._nlp = nlp
+        return cls._nlp
+
+    @property
+    def nlp(self):
+        return self._get_nlp()
+
+
     def extract_requirements(self, system_description):
         # Preprocess text
         sentences = self.preprocess_text(system_description)
@@ -80,145 +172,142 @@ class RequirementsExtractor:
     
     def preprocess_text(self, text):
         # Clean text
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
-        # Split into sentences
-        sentences = sent_tokenize(text)
+        # Split into sentences with the sentencizer only; the statistical
+        # components are disabled since boundaries are all we need here
+        doc = next(self.nlp.pipe([text], disable=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]))
+        sentences = [s.text for s in doc.sents]
         
         # Filter out short or irrelevant sentences
         sentences = [s for s in sentences if len(s.split()) > 5]
         
         return sentences
     
-    def extract_features(self, sentences):
-        features = []
-        
-        for sentence in sentences:
-            doc = self.nlp(sentence)
-            
-            # Extract various linguistic features
-            verbs = [token.lemma_ for token in doc if token.pos_ == "VERB"]
-            action_verbs = [v for v in verbs if v in ["allow", "enable", "provide", "support", "manage", "monitor", "check", "view", "book", "pay", "receive", "create", "track", "generate"]]
-            
-            nouns = [token.text for token in doc if token.pos_ == "NOUN"]
-            entities = [ent.text for ent in doc.ents]
-            
-            # Extract subject-verb-object patterns
-            svo_patterns = []
+    def extract_features(self, sentences, n_process=None):
+        # Only parse sentences that have not been seen before
+        parsed = {}
+        to_parse = [s for s in dict.fromkeys(sentences) if s not in _FEATURE_CACHE]
+
+        # Spread parsing across CPU cores for large corpora; worker spawn and
+        # IPC overhead dominate on small inputs, so stay single-process there
+        if n_process is None:
+            n_process = max(1, os.cpu_count() // 2) if len(to_parse) > 200 else 1
+
+        # Process sentences in batches so the tagger/parser run on minibatches
+        # instead of paying per-call overhead for every sentence
+        for sentence, doc in zip(to_parse, self.nlp.pipe(to_parse, batch_size=SPACY_BATCH_SIZE, n_process=n_process)):
+
+            # Collect verb lemmas in a single pass over the tokens; modal
+            # auxiliaries (should, must, will, ...) and subject-verb-object
+            # triples are counted by the shared matchers instead
+            verbs = []
+            action_verbs = []
+            for token in doc:
+                if token.pos_ == "VERB":
+                    lemma = token.lemma_
+                    verbs.append(lemma)
+                    if lemma in self.ACTION_VERBS:
+                        action_verbs.append(lemma)
+
+            n_modals = len(self._modal_matcher(doc))
+            n_svo = len(self._svo_matcher(doc))
+
+            # Walk the noun chunks once, collecting subjects, objects and
+            # prepositional objects in the same pass
+            actors = []
+            objects = []
+            context_objects = []
             for chunk in doc.noun_chunks:
-                if chunk.root.dep_ == "nsubj" and chunk.root.head.pos_ == "VERB":
-                    verb = chunk.root.head.lemma_
-                    subject = chunk.text
-                    
-                    # Try to find objects
-                    for token in doc:
-                        if token.head == chunk.root.head and token.dep_ in ["dobj", "pobj"]:
-                            obj = token.text
-                            svo_patterns.append((subject, verb, obj))
-            
-            # Extract modal verbs (should, must, will) which often indicate requirements
-            modals = [token.text for token in doc if token.dep_ == "aux" and token.text.lower() in
-                      ["should", "must", "will", "can", "could"]]
-            
-            features.append({
+                dep = chunk.root.dep_
+                if dep == "nsubj":
+                    actors.append(chunk.text)
+                elif dep in self._OBJECT_DEPS:
+                    objects.append(chunk.text)
+                    if dep == "pobj":
+                        context_objects.append(chunk.text)
+
+            # Keep only what the later stages read: the doc object and the
+            # raw token lists are dropped in favor of integer counts for the
+            # scored features and the resolved action verb, which also keeps
+            # the feature cache small
+            feature = {
                 "sentence": sentence,
-                "verbs": verbs,
-                "action_verbs": action_verbs,
-                "nouns": nouns,
-                "entities": entities,
-                "svo_patterns": svo_patterns,
-                "modals": modals,
-                "doc": doc
-            })
-        
-        return features
+                # Lowercase once here; scoring and formulation both need it
+                "sentence_lower": sentence.lower(),
+                "action": action_verbs[0] if action_verbs else (verbs[0] if verbs else None),
+                "n_action_verbs": len(action_verbs),
+                "n_modals": n_modals,
+                "n_svo": n_svo,
+                "actors": actors,
+                "objects": objects,
+                "context_objects": context_objects,
+            }
+            parsed[sentence] = feature
+            if len(_FEATURE_CACHE) < _FEATURE_CACHE_MAX:
+                _FEATURE_CACHE[sentence] = feature
+
+        # Assemble the features as DataFrame columns (struct-of-arrays) so
+        # scoring can run as column-wise operations instead of per-row loops
+        rows = [_FEATURE_CACHE[s] if s in _FEATURE_CACHE else parsed[s] for s in sentences]
+        return pd.DataFrame(rows, columns=["sentence", "sentence_lower", "action", "n_action_verbs", "n_modals", "n_svo", "actors", "objects", "context_objects"])
     
     def identify_potential_requirements(self, features):
-        potential_reqs = []
-        
-        for feature in features:
-            score = 0
-            
-            # Score based on action verbs
-            if feature["action_verbs"]:
-                score += len(feature["action_verbs"]) * 2
-                
-            # Score based on modal verbs
-            if feature["modals"]:
-                score += len(feature["modals"]) * 3
-                
-            # Score based on subject-verb-object patterns
-            if feature["svo_patterns"]:
-                score += len(feature["svo_patterns"]) * 2
-                
-            # Keywords that often indicate requirements
-            requirement_keywords = ["need", "require", "must", "should", "allow", "enable", "access", "view", "book", "reserve"]
-            if any(keyword in feature["sentence"].lower() for keyword in requirement_keywords):
-                score += 3
-            
-            # Check for system components mentioned
-            system_components = ["machine", "payment", "reservation", "notification", "camera", "account", "feedback", "review"]
-            if any(component in feature["sentence"].lower() for component in system_components):
-                score += 2
-                
-            # Check for user roles
-            user_roles = ["customer", "client", "user", "administrator", "owner"]
-            if any(role in feature["sentence"].lower() for role in user_roles):
-                score += 2
-                
-            # Store the potential requirement with its score
-            feature["req_score"] = score
-            potential_reqs.append(feature)
-        
-        # Sort by score and filter
-        potential_reqs.sort(key=lambda x: x["req_score"], reverse=True)
-        return [req for req in potential_reqs if req["req_score"] > 3]
+        if len(features) == 0:
+            return features.assign(req_score=0)
+
+        # One search per keyword family over each lowered sentence; searching
+        # the families separately keeps the semantics of the old `in` checks,
+        # where a hit for one family never hides a hit for another
+        lowered = features["sentence_lower"]
+        has_req = np.fromiter((self._REQ_KEYWORD_RE.search(s) is not None for s in lowered), np.int64, len(lowered))
+        has_comp = np.fromiter((self._COMPONENT_RE.search(s) is not None for s in lowered), np.int64, len(lowered))
+        has_role = np.fromiter((self._ROLE_RE.search(s) is not None for s in lowered), np.int64, len(lowered))
+
+        # Score action verbs, modal verbs, subject-verb-object patterns and
+        # the keyword flags as whole integer arrays at a time
+        score = _score_counts(
+            features["n_action_verbs"].to_numpy(np.int64),
+            features["n_modals"].to_numpy(np.int64),
+            features["n_svo"].to_numpy(np.int64),
+            has_req, has_comp, has_role)
+
+        # Filter first so rejected rows never pay for the sort, then order
+        # the survivors by score
+        features = features.assign(req_score=score)
+        features = features[features["req_score"] > 3]
+        return features.sort_values("req_score", ascending=False, kind="stable")
     
     def formulate_requirements(self, potential_reqs):
         formulated_reqs = []
         
-        for req in potential_reqs:
-            doc = req["doc"]
-            
-            # Try to identify the actor (subject)
-            actors = []
-            for chunk in doc.noun_chunks:
-                if chunk.root.dep_ == "nsubj":
-                    actors.append(chunk.text)
-            
-            # Identify primary stakeholder
-            if any(actor.lower() in ["customer", "client", "user"] for actor in actors if actor):
+        for req in potential_reqs.itertuples(index=False):
+            # Identify primary stakeholder from the precomputed subjects
+            if any(actor.lower() in self._CUSTOMER_ACTORS for actor in req.actors if actor):
                 primary_actor = "The customer"
-            elif any(actor.lower() in ["administrator", "admin", "owner"] for actor in actors if actor):
+            elif any(actor.lower() in self._ADMIN_ACTORS for actor in req.actors if actor):
                 primary_actor = "The administrator"
             else:
                 primary_actor = "The system"
-            
-            # Try to identify the action
-            actions = req["action_verbs"] if req["action_verbs"] else req["verbs"]
-            action = actions[0] if actions else "support"
-            
-            # Try to identify the object
-            objects = []
-            for chunk in doc.noun_chunks:
-                if chunk.root.dep_ in ["dobj", "pobj"]:
-                    objects.append(chunk.text)
-            
+
+            # The action verb was already resolved during feature extraction
+            action = req.action if req.action else "support"
+
             # Formulate the requirement
-            if actors and actions and objects:
-                requirement = f"{primary_actor} shall {action} {objects[0]}"
+            if req.actors and req.action and req.objects:
+                requirement = f"{primary_actor} shall {action} {req.objects[0]}"
             else:
                 # Fall back to template based on the sentence
-                requirement = f"{primary_actor} shall {action} {req['sentence'].lower()}"
+                requirement = f"{primary_actor} shall {action} {req.sentence_lower}"
             
             # Clean up the requirement
             requirement = requirement.replace("  ", " ").strip()
             
             # Add more context if available from the original sentence
-            for chunk in doc.noun_chunks:
-                if chunk.root.dep_ in ["pobj"] and chunk.text not in requirement:
+            for chunk_text in req.context_objects:
+                if chunk_text not in requirement:
                     if not requirement.endswith('.'):
-                        requirement += f" for {chunk.text}"
+                        requirement += f" for {chunk_text}"
                         
             formulated_reqs.append(requirement)
         
@@ -228,11 +317,12 @@ class RequirementsExtractor:
         # Remove duplicates
         unique_reqs = []
         seen = set()
-        
+
         for req in formulated_reqs:
-            # Create a simplified version for comparison
-            simple_req = re.sub(r'[^a-zA-Z0-9]', '', req.lower())
-            
+            # Create a simplified version for comparison; the precomputed
+            # deletion table makes this one pass and the set lookup O(1)
+            simple_req = req.lower().translate(_DEDUP_STRIP)
+
             # Check if we've seen this requirement
             if simple_req not in seen and len(req.split()) > 4:
                 seen.add(simple_req)
@@ -242,95 +332,69 @@ class RequirementsExtractor:
         refined_reqs = []
         for req in unique_reqs:
             # Make sure requirements start with standard phrases
-            if not any(req.lower().startswith(prefix) for prefix in ["the system shall", "the customer should", "the administrator should"]):
+            if not req.lower().startswith(self._STANDARD_PREFIXES):
                 req = f"The system shall {req}"
             
             # Ensure requirements end with a period
             if not req.endswith('.'):
                 req += '.'
                 
-            # Fix common issues
-            req = req.replace(" should be able to be able to ", " should be able to ")
-            req = req.replace(" should should ", " should ")
-            req = req.replace(" shall shall ", " shall ")
-            
+            # Fix common issues: collapse the doubled phrases the templates
+            # sometimes produce, in one pass
+            req = _DOUBLED_PHRASE_RE.sub(r'\1', req)
+
             refined_reqs.append(req)
         
         return refined_reqs
     
     def classify_requirements(self, refined_reqs):
-        classifications = []
-        
-        for req in refined_reqs:
-            doc = self.nlp(req)
-            
-            # Identify stakeholder
-            stakeholder = "System"
-            if "customer" in req.lower() or "client" in req.lower() or "user" in req.lower():
-                stakeholder = "Customer"
-            elif "administrator" in req.lower() or "admin" in req.lower() or "owner" in req.lower():
-                stakeholder = "Administrator"
-            
-            # Identify requirement type
-            req_type = "Functional"
-            non_functional_keywords = ["performance", "security", "reliability", "usability", "maintainability"]
-            if any(keyword in req.lower() for keyword in non_functional_keywords):
-                req_type = "Non-functional"
-            
-            # Identify feature category
-            categories = []
-            category_keywords = {
-                "Washing/Drying": ["machine", "washer", "dryer", "washing", "drying"],
-                "Security": ["security", "camera", "monitor", "surveillance"],
-                "Scheduling": ["schedule", "booking", "reservation", "book", "reserve"],
-                "Payment": ["payment", "pay", "coin", "card", "credit", "debit"],
-                "Reporting": ["report", "record", "track", "log"],
-                "Communication": ["communicate", "notification", "alert", "message"],
-                "Feedback": ["feedback", "review", "comment", "rating"]
-            }
-            
-            for category, keywords in category_keywords.items():
-                if any(keyword in req.lower() for keyword in keywords):
-                    categories.append(category)
-            
-            if not categories:
-                categories = ["General"]
-            
-            classifications.append({
-                "requirement": req,
-                "stakeholder": stakeholder,
-                "type": req_type,
-                "categories": categories
-            })
-        
-        return classifications
+        # Classification is pure keyword matching on the requirement text,
+        # so run it as vectorized string operations over the whole list at
+        # once instead of a per-requirement Python loop
+        if not refined_reqs:
+            return []
+
+        reqs = pd.Series(refined_reqs)
+        lowered = reqs.str.lower()
+
+        # Identify stakeholder; customer keywords take precedence over
+        # administrator ones, as in the old if/elif chain
+        stakeholder = pd.Series("System", index=reqs.index)
+        stakeholder[lowered.str.contains(self._ADMIN_RE)] = "Administrator"
+        stakeholder[lowered.str.contains(self._CUSTOMER_RE)] = "Customer"
+
+        # Identify requirement type
+        req_type = lowered.str.contains(self._NON_FUNCTIONAL_RE).map(
+            {True: "Non-functional", False: "Functional"})
+
+        # Identify feature category: one vectorized scan per category, then
+        # the per-row flag columns are folded into category lists
+        category_flags = {category: lowered.str.contains(pattern)
+                          for category, pattern in self._CATEGORY_RES.items()}
+        categories = [
+            [category for category, flags in category_flags.items() if flags.iat[i]] or ["General"]
+            for i in range(len(reqs))
+        ]
+
+        return pd.DataFrame({
+            "requirement": reqs,
+            "stakeholder": stakeholder,
+            "type": req_type,
+            "categories": categories,
+        }).to_dict("records")
 
     def extract_and_format(self, system_description):
         """
         Extract and format requirements from system description into a structured format
         """
         classified_reqs = self.extract_requirements(system_description)
-        
-        # Group by stakeholder
-        customer_reqs = [req for req in classified_reqs if req["stakeholder"] == "Customer"]
-        admin_reqs = [req for req in classified_reqs if req["stakeholder"] == "Administrator"]
-        system_reqs = [req for req in classified_reqs if req["stakeholder"] == "System"]
-        
-        formatted_reqs = []
-        
-        # Format customer requirements
-        for req in customer_reqs:
-            formatted_reqs.append(req["requirement"])
-            
-        # Format admin requirements
-        for req in admin_reqs:
-            formatted_reqs.append(req["requirement"])
-            
-        # Format system requirements
-        for req in system_reqs:
-            formatted_reqs.append(req["requirement"])
-            
-        return formatted_reqs
+
+        # Emit customer, then administrator, then system requirements with a
+        # single stable sort instead of one filtered list per stakeholder;
+        # relative order within each group is preserved
+        order = {"Customer": 0, "Administrator": 1, "System": 2}
+        return [req["requirement"]
+                for req in sorted(classified_reqs, key=lambda req: order.get(req["stakeholder"], 3))]
 
 
 # Example usage